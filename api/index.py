@@ -1,17 +1,23 @@
 import os
-import uuid
+import base64
+import time
+import threading
 import traceback
+from collections import OrderedDict
 from datetime import date, datetime, timedelta
-from typing import Optional, List
-from fastapi import FastAPI, HTTPException, Request, Response, Depends
+from typing import Annotated, Optional, List
+from fastapi import FastAPI, HTTPException, Request, Response, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
-from pydantic import BaseModel
+from pydantic import AfterValidator, BaseModel
 from httpx import AsyncClient
 from jose import jwt
 from itsdangerous import URLSafeTimedSerializer
+import orjson
 import psycopg
+from psycopg_pool import ConnectionPool
 
 DATABASE_URL = os.getenv("DATABASE_URL", "")
 
@@ -23,22 +29,59 @@ if not APP_URL:
     raise RuntimeError("APP_URL environment variable is required")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_DAYS = 30
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "30"))
+COLLECTION_CACHE_SIZE = 1024
+DB_POOL_TIMEOUT = 30
+DB_POOL_MAX_LIFETIME = 1800
+DB_PREPARE_THRESHOLD = os.getenv("DB_PREPARE_THRESHOLD", "5")
+DB_PREPARE_THRESHOLD = int(DB_PREPARE_THRESHOLD) if DB_PREPARE_THRESHOLD else None
+DB_PREPARED_MAX = 512
 
 state_serializer = URLSafeTimedSerializer(JWT_SECRET_KEY)
 
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL environment variable is required")
 
+DB_SESSION_OPTIONS = os.getenv("DB_SESSION_OPTIONS", "")
+
+
+def configure_connection(conn):
+    conn.prepare_threshold = DB_PREPARE_THRESHOLD
+    conn.prepared_max = DB_PREPARED_MAX
+
+
+db_pool = ConnectionPool(
+    DATABASE_URL,
+    min_size=DB_POOL_MIN_SIZE,
+    max_size=DB_POOL_MAX_SIZE,
+    kwargs={
+        "row_factory": psycopg.rows.dict_row,
+        "autocommit": True,
+        "options": DB_SESSION_OPTIONS,
+    },
+    configure=configure_connection,
+    check=ConnectionPool.check_connection,
+    timeout=DB_POOL_TIMEOUT,
+    max_lifetime=DB_POOL_MAX_LIFETIME,
+    open=True,
+)
+
 _db_initialized = False
+_db_init_lock = threading.Lock()
 
 
 def get_db():
     global _db_initialized
-    conn = psycopg.connect(DATABASE_URL, row_factory=psycopg.rows.dict_row)
     if not _db_initialized:
-        init_db_tables(conn)
-        _db_initialized = True
-    return conn
+        with _db_init_lock:
+            if not _db_initialized:
+                with db_pool.connection() as conn:
+                    init_db_tables(conn)
+                _db_initialized = True
+    return db_pool.connection()
 
 
 DEFAULT_CATEGORIES = [
@@ -55,8 +98,21 @@ DEFAULT_CATEGORIES = [
 ]
 
 
+SCHEMA_VERSION = 3
+
+
+def get_schema_version(cursor) -> int:
+    try:
+        cursor.execute("SELECT MAX(version) AS version FROM schema_version")
+    except psycopg.errors.UndefinedTable:
+        return 0
+    return cursor.fetchone()["version"] or 0
+
+
 def init_db_tables(conn):
     cursor = conn.cursor()
+    if get_schema_version(cursor) >= SCHEMA_VERSION:
+        return
 
     cursor.execute(
         """
@@ -104,7 +160,7 @@ def init_db_tables(conn):
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS categories (
-            id TEXT PRIMARY KEY,
+            id TEXT PRIMARY KEY DEFAULT gen_random_uuid()::text,
             cashflow_id TEXT NOT NULL REFERENCES cashflows(id) ON DELETE CASCADE,
             name TEXT NOT NULL,
             type TEXT NOT NULL CHECK(type IN ('income', 'expense')),
@@ -118,7 +174,7 @@ def init_db_tables(conn):
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS plans (
-            id TEXT PRIMARY KEY,
+            id TEXT PRIMARY KEY DEFAULT gen_random_uuid()::text,
             cashflow_id TEXT NOT NULL REFERENCES cashflows(id) ON DELETE CASCADE,
             category_id TEXT NOT NULL REFERENCES categories(id),
             name TEXT NOT NULL,
@@ -138,7 +194,7 @@ def init_db_tables(conn):
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS entries (
-            id TEXT PRIMARY KEY,
+            id TEXT PRIMARY KEY DEFAULT gen_random_uuid()::text,
             plan_id TEXT NOT NULL REFERENCES plans(id) ON DELETE CASCADE,
             month_year TEXT NOT NULL,
             amount REAL NOT NULL,
@@ -160,12 +216,66 @@ def init_db_tables(conn):
     """
     )
 
-    conn.commit()
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_plans_cashflow_name ON plans(cashflow_id, name, id)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_plans_active ON plans(cashflow_id, name, id) WHERE status = 'active'"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_plan ON entries(plan_id)")
+
+    for table in ("categories", "plans", "entries"):
+        cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()::text")
+
+    cursor.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+    cursor.execute("INSERT INTO schema_version (version) VALUES (%s)", (SCHEMA_VERSION,))
+
+
+CASHFLOW_COLUMNS = "id, name, description, owner_id, share_id, is_public, created_at, updated_at"
+
+INSERT_CASHFLOW = """INSERT INTO cashflows (id, name, description, owner_id, share_id, is_public, created_at, updated_at)
+                     VALUES (%s, %s, %s, %s, %s, 0, %s, %s)"""
+
+INSERT_OWNER = """INSERT INTO cashflow_members (id, cashflow_id, user_id, role, invited_at)
+                  VALUES (%s, %s, %s, 'owner', %s)"""
+
+INSERT_CATEGORY = """INSERT INTO categories (id, cashflow_id, name, type, icon, color)
+                     VALUES (%s, %s, %s, %s, %s, %s)"""
+
+INSERT_PLAN = """INSERT INTO plans (id, cashflow_id, category_id, name, expected_amount, frequency,
+                 expected_day, start_month, end_month, status, notes, created_at, updated_at)
+                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
+
+INSERT_ENTRY = """INSERT INTO entries (id, plan_id, month_year, amount, date, notes, created_at)
+                  VALUES (%s, %s, %s, %s, %s, %s, %s)"""
+
+INSERT_SETTING = "INSERT INTO settings (cashflow_id, key, value) VALUES (%s, %s, %s)"
+
+
+CATEGORY_TYPES = frozenset({"income", "expense"})
+PLAN_FREQUENCIES = frozenset({"one-time", "weekly", "biweekly", "monthly"})
+PLAN_STATUSES = frozenset({"active", "completed"})
+
+
+def one_of(allowed: frozenset, field: str):
+    message = f"{field} must be one of: {', '.join(sorted(allowed))}"
+
+    def check(value: str) -> str:
+        if value not in allowed:
+            raise ValueError(message)
+        return value
+
+    return AfterValidator(check)
+
+
+CategoryType = Annotated[str, one_of(CATEGORY_TYPES, "type")]
+PlanFrequency = Annotated[str, one_of(PLAN_FREQUENCIES, "frequency")]
+PlanStatus = Annotated[str, one_of(PLAN_STATUSES, "status")]
 
 
 class CategoryBase(BaseModel):
     name: str
-    type: str
+    type: CategoryType
     icon: Optional[str] = None
     color: Optional[str] = None
 
@@ -178,7 +288,7 @@ class PlanBase(BaseModel):
     category_id: str
     name: str
     expected_amount: float
-    frequency: str
+    frequency: PlanFrequency
     expected_day: Optional[int] = None
     start_month: str
     end_month: Optional[str] = None
@@ -193,11 +303,11 @@ class PlanUpdate(BaseModel):
     category_id: Optional[str] = None
     name: Optional[str] = None
     expected_amount: Optional[float] = None
-    frequency: Optional[str] = None
+    frequency: Optional[PlanFrequency] = None
     expected_day: Optional[int] = None
     start_month: Optional[str] = None
     end_month: Optional[str] = None
-    status: Optional[str] = None
+    status: Optional[PlanStatus] = None
     notes: Optional[str] = None
 
 
@@ -227,6 +337,10 @@ class EntryUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class EntryBulkUpdate(EntryUpdate):
+    id: str
+
+
 class EntryResponse(EntryBase):
     id: str
     created_at: str
@@ -294,7 +408,12 @@ class MemberRoleUpdate(BaseModel):
     role: str
 
 
-app = FastAPI(title="Cashflow Tracker API")
+class ORJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(title="Cashflow Tracker API", default_response_class=ORJSONResponse)
 
 
 class ErrorHandlerMiddleware(BaseHTTPMiddleware):
@@ -323,6 +442,30 @@ app.add_middleware(
 )
 
 
+_clock_cache = [-1, ""]
+
+
+def today_iso() -> str:
+    second = int(time.time())
+    if _clock_cache[0] != second:
+        _clock_cache[:] = [second, date.today().isoformat()]
+    return _clock_cache[1]
+
+
+def format_uuid4(raw: bytes) -> str:
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
+
+
+def new_id() -> str:
+    return format_uuid4(os.urandom(16))
+
+
+def new_ids(count: int) -> List[str]:
+    blob = os.urandom(16 * count)
+    return [format_uuid4(blob[i : i + 16]) for i in range(0, len(blob), 16)]
+
+
 def create_jwt_token(user_id: str) -> str:
     expire = datetime.utcnow() + timedelta(days=JWT_EXPIRATION_DAYS)
     payload = {"sub": user_id, "exp": expire}
@@ -348,21 +491,14 @@ def require_auth(request: Request) -> str:
     return user_id
 
 
-def get_user_by_id(user_id: str, conn=None):
-    should_close = conn is None
-    if conn is None:
-        conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, email, name, avatar_url, provider, created_at FROM users WHERE id = %s",
-        (user_id,),
-    )
-    row = cursor.fetchone()
-    if should_close:
-        conn.close()
-    if not row:
-        return None
-    return dict(row)
+def get_user_by_id(user_id: str):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id, email, name, avatar_url, provider, created_at FROM users WHERE id = %s",
+            (user_id,),
+        )
+        return cursor.fetchone()
 
 
 def get_or_create_user(
@@ -372,88 +508,77 @@ def get_or_create_user(
     provider: str,
     provider_id: str,
 ):
-    conn = get_db()
-    cursor = conn.cursor()
+    with get_db() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute(
-        "SELECT id, email, name, avatar_url, provider, created_at FROM users WHERE provider = %s AND provider_id = %s",
-        (provider, provider_id),
-    )
-    row = cursor.fetchone()
+        cursor.execute(
+            "SELECT id, email, name, avatar_url, provider, created_at FROM users WHERE provider = %s AND provider_id = %s",
+            (provider, provider_id),
+        )
+        row = cursor.fetchone()
 
-    if row:
-        user = dict(row)
-        conn.close()
-        return user, False
+        if row:
+            return row, False
 
-    cursor.execute("SELECT id FROM users WHERE email = %s", (email,))
-    existing = cursor.fetchone()
-    if existing:
-        conn.close()
-        raise HTTPException(
-            status_code=400, detail="Email already registered with different provider"
+        cursor.execute("SELECT id FROM users WHERE email = %s", (email,))
+        existing = cursor.fetchone()
+        if existing:
+            raise HTTPException(
+                status_code=400, detail="Email already registered with different provider"
+            )
+
+        user_id = new_id()
+        now = datetime.utcnow().isoformat()
+        cursor.execute(
+            "INSERT INTO users (id, email, name, avatar_url, provider, provider_id, created_at) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            (user_id, email, name, avatar_url, provider, provider_id, now),
         )
 
-    user_id = str(uuid.uuid4())
-    now = datetime.utcnow().isoformat()
-    cursor.execute(
-        "INSERT INTO users (id, email, name, avatar_url, provider, provider_id, created_at) VALUES (%s, %s, %s, %s, %s, %s, %s)",
-        (user_id, email, name, avatar_url, provider, provider_id, now),
-    )
-    conn.commit()
-
-    user = {
-        "id": user_id,
-        "email": email,
-        "name": name,
-        "avatar_url": avatar_url,
-        "provider": provider,
-        "created_at": now,
-    }
-    conn.close()
+        user = {
+            "id": user_id,
+            "email": email,
+            "name": name,
+            "avatar_url": avatar_url,
+            "provider": provider,
+            "created_at": now,
+        }
     return user, True
 
 
 def create_default_cashflow(user_id: str, user_name: Optional[str]):
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cashflow_id = str(uuid.uuid4())
-    share_id = str(uuid.uuid4())
-    now = datetime.utcnow().isoformat()
-    name = f"{user_name}'s Budget" if user_name else "My Budget"
-
-    cursor.execute(
-        "INSERT INTO cashflows (id, name, description, owner_id, share_id, is_public, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, 0, %s, %s)",
-        (cashflow_id, name, None, user_id, share_id, now, now),
-    )
+    with get_db() as conn:
+        cursor = conn.cursor()
+
+        cashflow_id = new_id()
+        share_id = new_id()
+        now = datetime.utcnow().isoformat()
+        name = f"{user_name}'s Budget" if user_name else "My Budget"
+
+        with conn.transaction():
+            cursor.execute(
+                INSERT_CASHFLOW,
+                (cashflow_id, name, None, user_id, share_id, now, now),
+            )
 
-    member_id = str(uuid.uuid4())
-    cursor.execute(
-        "INSERT INTO cashflow_members (id, cashflow_id, user_id, role, invited_at) VALUES (%s, %s, %s, 'owner', %s)",
-        (member_id, cashflow_id, user_id, now),
-    )
+            member_id = new_id()
+            cursor.execute(
+                INSERT_OWNER,
+                (member_id, cashflow_id, user_id, now),
+            )
 
-    for cat in DEFAULT_CATEGORIES:
-        cursor.execute(
-            "INSERT INTO categories (id, cashflow_id, name, type, icon, color) VALUES (%s, %s, %s, %s, %s, %s)",
-            (
-                str(uuid.uuid4()),
-                cashflow_id,
-                cat["name"],
-                cat["type"],
-                cat["icon"],
-                cat["color"],
-            ),
-        )
+            cursor.executemany(
+                INSERT_CATEGORY,
+                [
+                    (cat_id, cashflow_id, cat["name"], cat["type"], cat["icon"], cat["color"])
+                    for cat, cat_id in zip(DEFAULT_CATEGORIES, new_ids(len(DEFAULT_CATEGORIES)))
+                ],
+            )
 
-    cursor.execute(
-        "INSERT INTO settings (cashflow_id, key, value) VALUES (%s, 'starting_balance', '0')",
-        (cashflow_id,),
-    )
+            cursor.execute(
+                INSERT_SETTING,
+                (cashflow_id, "starting_balance", "0"),
+            )
 
-    conn.commit()
-    conn.close()
     return cashflow_id
 
 
@@ -463,14 +588,13 @@ def check_cashflow_access(
     if required_roles is None:
         required_roles = ["owner", "editor", "viewer"]
 
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT role FROM cashflow_members WHERE cashflow_id = %s AND user_id = %s",
-        (cashflow_id, user_id),
-    )
-    row = cursor.fetchone()
-    conn.close()
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT role FROM cashflow_members WHERE cashflow_id = %s AND user_id = %s",
+            (cashflow_id, user_id),
+        )
+        row = cursor.fetchone()
 
     if not row:
         raise HTTPException(status_code=403, detail="Access denied to this cashflow")
@@ -544,10 +668,12 @@ async def auth_callback(provider: str, code: str, state: str):
         else:
             raise HTTPException(status_code=400, detail="Invalid provider")
 
-    user, is_new = get_or_create_user(email, name, avatar_url, provider, provider_id)
+    user, is_new = await run_in_threadpool(
+        get_or_create_user, email, name, avatar_url, provider, provider_id
+    )
 
     if is_new:
-        create_default_cashflow(user["id"], user.get("name"))
+        await run_in_threadpool(create_default_cashflow, user["id"], user.get("name"))
 
     jwt_token = create_jwt_token(user["id"])
 
@@ -588,64 +714,57 @@ def auth_me(request: Request):
 def list_cashflows(request: Request):
     user_id = require_auth(request)
 
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        """SELECT c.id, c.name, c.description, c.owner_id, c.share_id, c.is_public, c.created_at, c.updated_at, cm.role
-           FROM cashflows c
-           JOIN cashflow_members cm ON c.id = cm.cashflow_id
-           WHERE cm.user_id = %s
-           ORDER BY c.name""",
-        (user_id,),
-    )
-    rows = cursor.fetchall()
-    conn.close()
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """SELECT c.id, c.name, c.description, c.owner_id, c.share_id, c.is_public = 1 AS is_public,
+                      c.created_at, c.updated_at, cm.role
+               FROM cashflows c
+               JOIN cashflow_members cm ON c.id = cm.cashflow_id
+               WHERE cm.user_id = %s
+               ORDER BY c.name""",
+            (user_id,),
+        )
+        rows = cursor.fetchall()
 
-    return [{**dict(row), "is_public": bool(row["is_public"])} for row in rows]
+    return ORJSONResponse(rows)
 
 
 @app.post("/api/cashflows", status_code=201)
 def create_cashflow(cashflow: CashflowCreate, request: Request):
     user_id = require_auth(request)
 
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cashflow_id = str(uuid.uuid4())
-    share_id = str(uuid.uuid4())
-    now = datetime.utcnow().isoformat()
+    with get_db() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute(
-        "INSERT INTO cashflows (id, name, description, owner_id, share_id, is_public, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, 0, %s, %s)",
-        (cashflow_id, cashflow.name, cashflow.description, user_id, share_id, now, now),
-    )
+        cashflow_id = new_id()
+        share_id = new_id()
+        now = datetime.utcnow().isoformat()
 
-    member_id = str(uuid.uuid4())
-    cursor.execute(
-        "INSERT INTO cashflow_members (id, cashflow_id, user_id, role, invited_at) VALUES (%s, %s, %s, 'owner', %s)",
-        (member_id, cashflow_id, user_id, now),
-    )
+        with conn.transaction():
+            cursor.execute(
+                INSERT_CASHFLOW,
+                (cashflow_id, cashflow.name, cashflow.description, user_id, share_id, now, now),
+            )
 
-    for cat in DEFAULT_CATEGORIES:
-        cursor.execute(
-            "INSERT INTO categories (id, cashflow_id, name, type, icon, color) VALUES (%s, %s, %s, %s, %s, %s)",
-            (
-                str(uuid.uuid4()),
-                cashflow_id,
-                cat["name"],
-                cat["type"],
-                cat["icon"],
-                cat["color"],
-            ),
-        )
+            member_id = new_id()
+            cursor.execute(
+                INSERT_OWNER,
+                (member_id, cashflow_id, user_id, now),
+            )
 
-    cursor.execute(
-        "INSERT INTO settings (cashflow_id, key, value) VALUES (%s, 'starting_balance', '0')",
-        (cashflow_id,),
-    )
+            cursor.executemany(
+                INSERT_CATEGORY,
+                [
+                    (cat_id, cashflow_id, cat["name"], cat["type"], cat["icon"], cat["color"])
+                    for cat, cat_id in zip(DEFAULT_CATEGORIES, new_ids(len(DEFAULT_CATEGORIES)))
+                ],
+            )
 
-    conn.commit()
-    conn.close()
+            cursor.execute(
+                INSERT_SETTING,
+                (cashflow_id, "starting_balance", "0"),
+            )
 
     return {
         "id": cashflow_id,
@@ -665,22 +784,20 @@ def get_cashflow(cashflow_id: str, request: Request):
     user_id = require_auth(request)
     role = check_cashflow_access(user_id, cashflow_id)
 
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, name, description, owner_id, share_id, is_public, created_at, updated_at FROM cashflows WHERE id = %s",
-        (cashflow_id,),
-    )
-    row = cursor.fetchone()
-    conn.close()
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT {CASHFLOW_COLUMNS}, xmin::text AS version FROM cashflows WHERE id = %s",
+            (cashflow_id,),
+        )
+        row = cursor.fetchone()
 
     if not row:
         raise HTTPException(status_code=404, detail="Cashflow not found")
 
-    result = dict(row)
-    result["role"] = role
-    result["is_public"] = bool(result["is_public"])
-    return result
+    row["role"] = role
+    row["is_public"] = bool(row["is_public"])
+    return etag_response(row, request, role)
 
 
 @app.put("/api/cashflows/{cashflow_id}")
@@ -688,61 +805,54 @@ def update_cashflow(cashflow_id: str, cashflow: CashflowUpdate, request: Request
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
 
-    conn = get_db()
-    cursor = conn.cursor()
-    now = datetime.utcnow().isoformat()
-
-    updates = []
-    params = []
-    data = cashflow.model_dump(exclude_unset=True)
-
-    for key, value in data.items():
-        updates.append(f"{key} = %s")
-        params.append(value)
+    with get_db() as conn:
+        cursor = conn.cursor()
+        now = datetime.utcnow().isoformat()
 
-    if updates:
-        updates.append("updated_at = %s")
-        params.append(now)
-        params.append(cashflow_id)
+        fields = sorted(cashflow.model_fields_set)
+        updates = [f"{field} = %s" for field in fields]
+        params = [getattr(cashflow, field) for field in fields]
 
-        cursor.execute(
-            f"UPDATE cashflows SET {', '.join(updates)} WHERE id = %s", params
-        )
-        conn.commit()
+        if updates:
+            updates.append("updated_at = %s")
+            params.append(now)
+            params.append(cashflow_id)
 
-    cursor.execute(
-        "SELECT id, name, description, owner_id, share_id, is_public, created_at, updated_at FROM cashflows WHERE id = %s",
-        (cashflow_id,),
-    )
-    row = cursor.fetchone()
-    conn.close()
+            cursor.execute(
+                f"UPDATE cashflows SET {', '.join(updates)} WHERE id = %s RETURNING {CASHFLOW_COLUMNS}",
+                params,
+            )
+        else:
+            cursor.execute(
+                f"SELECT {CASHFLOW_COLUMNS} FROM cashflows WHERE id = %s", (cashflow_id,)
+            )
+        row = cursor.fetchone()
 
-    result = dict(row)
-    result["role"] = "owner"
-    result["is_public"] = bool(result["is_public"])
-    return result
+    row["role"] = "owner"
+    row["is_public"] = bool(row["is_public"])
+    return row
 
 
-@app.delete("/api/cashflows/{cashflow_id}", status_code=204)
+@app.delete("/api/cashflows/{cashflow_id}", status_code=204, response_class=Response)
 def delete_cashflow(cashflow_id: str, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id, ["owner"])
 
-    conn = get_db()
-    cursor = conn.cursor()
+    with get_db() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("DELETE FROM settings WHERE cashflow_id = %s", (cashflow_id,))
-    cursor.execute(
-        "DELETE FROM entries WHERE plan_id IN (SELECT id FROM plans WHERE cashflow_id = %s)",
-        (cashflow_id,),
-    )
-    cursor.execute("DELETE FROM plans WHERE cashflow_id = %s", (cashflow_id,))
-    cursor.execute("DELETE FROM categories WHERE cashflow_id = %s", (cashflow_id,))
-    cursor.execute("DELETE FROM cashflow_members WHERE cashflow_id = %s", (cashflow_id,))
-    cursor.execute("DELETE FROM cashflows WHERE id = %s", (cashflow_id,))
+        with conn.transaction():
+            cursor.execute("DELETE FROM settings WHERE cashflow_id = %s", (cashflow_id,))
+            cursor.execute(
+                "DELETE FROM entries WHERE plan_id IN (SELECT id FROM plans WHERE cashflow_id = %s)",
+                (cashflow_id,),
+            )
+            cursor.execute("DELETE FROM plans WHERE cashflow_id = %s", (cashflow_id,))
+            cursor.execute("DELETE FROM categories WHERE cashflow_id = %s", (cashflow_id,))
+            cursor.execute("DELETE FROM cashflow_members WHERE cashflow_id = %s", (cashflow_id,))
+            cursor.execute("DELETE FROM cashflows WHERE id = %s", (cashflow_id,))
 
-    conn.commit()
-    conn.close()
+    return Response(status_code=204)
 
 
 @app.get("/api/cashflows/{cashflow_id}/members")
@@ -750,20 +860,19 @@ def list_cashflow_members(cashflow_id: str, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id)
 
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        """SELECT cm.id, cm.user_id, u.email, u.name, u.avatar_url, cm.role, cm.invited_at
-           FROM cashflow_members cm
-           JOIN users u ON cm.user_id = u.id
-           WHERE cm.cashflow_id = %s
-           ORDER BY cm.role, u.name""",
-        (cashflow_id,),
-    )
-    rows = cursor.fetchall()
-    conn.close()
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """SELECT cm.id, cm.user_id, u.email, u.name, u.avatar_url, cm.role, cm.invited_at
+               FROM cashflow_members cm
+               JOIN users u ON cm.user_id = u.id
+               WHERE cm.cashflow_id = %s
+               ORDER BY cm.role, u.name""",
+            (cashflow_id,),
+        )
+        rows = cursor.fetchall()
 
-    return [dict(row) for row in rows]
+    return ORJSONResponse(rows)
 
 
 @app.post("/api/cashflows/{cashflow_id}/members", status_code=201)
@@ -776,39 +885,35 @@ def invite_member(cashflow_id: str, member: CashflowMemberBase, request: Request
             status_code=400, detail="Invalid role. Must be 'editor' or 'viewer'"
         )
 
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        "SELECT id, name, avatar_url FROM users WHERE email = %s", (member.email,)
-    )
-    user_row = cursor.fetchone()
+    with get_db() as conn:
+        cursor = conn.cursor()
 
-    if not user_row:
-        conn.close()
-        raise HTTPException(
-            status_code=404, detail="User not found. They must sign up first."
+        cursor.execute(
+            "SELECT id, name, avatar_url FROM users WHERE email = %s", (member.email,)
         )
+        user_row = cursor.fetchone()
 
-    target_user_id = user_row["id"]
+        if not user_row:
+            raise HTTPException(
+                status_code=404, detail="User not found. They must sign up first."
+            )
 
-    cursor.execute(
-        "SELECT id FROM cashflow_members WHERE cashflow_id = %s AND user_id = %s",
-        (cashflow_id, target_user_id),
-    )
-    if cursor.fetchone():
-        conn.close()
-        raise HTTPException(status_code=400, detail="User is already a member")
+        target_user_id = user_row["id"]
+
+        cursor.execute(
+            "SELECT id FROM cashflow_members WHERE cashflow_id = %s AND user_id = %s",
+            (cashflow_id, target_user_id),
+        )
+        if cursor.fetchone():
+            raise HTTPException(status_code=400, detail="User is already a member")
 
-    member_id = str(uuid.uuid4())
-    now = datetime.utcnow().isoformat()
+        member_id = new_id()
+        now = datetime.utcnow().isoformat()
 
-    cursor.execute(
-        "INSERT INTO cashflow_members (id, cashflow_id, user_id, role, invited_at) VALUES (%s, %s, %s, %s, %s)",
-        (member_id, cashflow_id, target_user_id, member.role, now),
-    )
-    conn.commit()
-    conn.close()
+        cursor.execute(
+            "INSERT INTO cashflow_members (id, cashflow_id, user_id, role, invited_at) VALUES (%s, %s, %s, %s, %s)",
+            (member_id, cashflow_id, target_user_id, member.role, now),
+        )
 
     return {
         "id": member_id,
@@ -821,6 +926,15 @@ def invite_member(cashflow_id: str, member: CashflowMemberBase, request: Request
     }
 
 
+def get_member_role(cursor, cashflow_id: str, member_user_id: str) -> Optional[str]:
+    cursor.execute(
+        "SELECT role FROM cashflow_members WHERE cashflow_id = %s AND user_id = %s",
+        (cashflow_id, member_user_id),
+    )
+    row = cursor.fetchone()
+    return row["role"] if row else None
+
+
 @app.put("/api/cashflows/{cashflow_id}/members/{member_user_id}")
 def update_member_role(
     cashflow_id: str,
@@ -836,247 +950,342 @@ def update_member_role(
             status_code=400, detail="Invalid role. Must be 'editor' or 'viewer'"
         )
 
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        "SELECT role FROM cashflow_members WHERE cashflow_id = %s AND user_id = %s",
-        (cashflow_id, member_user_id),
-    )
-    row = cursor.fetchone()
-
-    if not row:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Member not found")
-
-    if row["role"] == "owner":
-        conn.close()
-        raise HTTPException(status_code=400, detail="Cannot change owner's role")
+    with get_db() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute(
-        "UPDATE cashflow_members SET role = %s WHERE cashflow_id = %s AND user_id = %s",
-        (role_update.role, cashflow_id, member_user_id),
-    )
-    conn.commit()
-    conn.close()
+        cursor.execute(
+            """UPDATE cashflow_members SET role = %s
+               WHERE cashflow_id = %s AND user_id = %s AND role <> 'owner'
+               RETURNING role""",
+            (role_update.role, cashflow_id, member_user_id),
+        )
+        if not cursor.fetchone():
+            if get_member_role(cursor, cashflow_id, member_user_id):
+                raise HTTPException(status_code=400, detail="Cannot change owner's role")
+            raise HTTPException(status_code=404, detail="Member not found")
 
     return {"message": "Role updated"}
 
 
-@app.delete("/api/cashflows/{cashflow_id}/members/{member_user_id}", status_code=204)
+@app.delete("/api/cashflows/{cashflow_id}/members/{member_user_id}", status_code=204, response_class=Response)
 def remove_member(cashflow_id: str, member_user_id: str, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id, ["owner"])
 
-    conn = get_db()
-    cursor = conn.cursor()
+    with get_db() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute(
-        "SELECT role FROM cashflow_members WHERE cashflow_id = %s AND user_id = %s",
-        (cashflow_id, member_user_id),
-    )
-    row = cursor.fetchone()
+        cursor.execute(
+            """DELETE FROM cashflow_members
+               WHERE cashflow_id = %s AND user_id = %s AND role <> 'owner'""",
+            (cashflow_id, member_user_id),
+        )
+        if cursor.rowcount == 0:
+            if get_member_role(cursor, cashflow_id, member_user_id):
+                raise HTTPException(status_code=400, detail="Cannot remove owner")
+            raise HTTPException(status_code=404, detail="Member not found")
+    return Response(status_code=204)
 
-    if not row:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Member not found")
 
-    if row["role"] == "owner":
-        conn.close()
-        raise HTTPException(status_code=400, detail="Cannot remove owner")
+SHARED_CASHFLOW = "(SELECT id FROM cashflows WHERE share_id = %s AND is_public = 1)"
 
-    cursor.execute(
-        "DELETE FROM cashflow_members WHERE cashflow_id = %s AND user_id = %s",
-        (cashflow_id, member_user_id),
-    )
-    conn.commit()
-    conn.close()
+
+def collection_etag(key: str) -> str:
+    return f"""'W/"' || md5(COALESCE(string_agg(xmin::text, ',' ORDER BY {key}), '')) || '"'"""
+
+
+_collection_cache = OrderedDict()
+_collection_cache_lock = threading.Lock()
+CACHED_COLLECTIONS = {"categories", "settings"}
+
+
+def get_collection(
+    table: str,
+    key: str,
+    body_json: str,
+    cashflow_id: Optional[str],
+    request: Request,
+    share_id: Optional[str] = None,
+):
+    cache_key = (table, cashflow_id, share_id)
+    if_none_match = request.headers.get("if-none-match")
+    hit = None
+    if table in CACHED_COLLECTIONS:
+        with _collection_cache_lock:
+            hit = _collection_cache.get(cache_key)
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""WITH s AS (SELECT {SHARED_CASHFLOW if share_id else "%s::text"} AS id)
+               SELECT s.id AS cashflow_id, v.etag,
+                      CASE WHEN v.etag IN (%s, %s) THEN NULL
+                           ELSE (SELECT {body_json} FROM {table} WHERE cashflow_id = s.id)::text END AS body
+               FROM s, LATERAL (SELECT {collection_etag(key)} AS etag FROM {table} WHERE cashflow_id = s.id) v""",
+            (share_id or cashflow_id, if_none_match, hit[0] if hit else None),
+        )
+        row = cursor.fetchone()
+
+    if row["cashflow_id"] is None:
+        raise HTTPException(status_code=404, detail="Cashflow not found")
+    if row["etag"] == if_none_match:
+        return Response(status_code=304, headers={"ETag": row["etag"]})
+
+    body = row["body"] if row["body"] is not None else hit[1]
+    if table in CACHED_COLLECTIONS:
+        with _collection_cache_lock:
+            _collection_cache[cache_key] = (row["etag"], body)
+            _collection_cache.move_to_end(cache_key)
+            if len(_collection_cache) > COLLECTION_CACHE_SIZE:
+                _collection_cache.popitem(last=False)
+    return Response(body, media_type="application/json", headers={"ETag": row["etag"]})
+
+
+def etag_response(row: dict, request: Request, *extra: str):
+    etag = f'W/"{"-".join([row.pop("version"), *extra])}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(row, headers={"ETag": etag})
+
+
+CATEGORIES_AGG = """COALESCE(json_agg(json_build_object(
+                  'id', id, 'cashflow_id', cashflow_id, 'name', name,
+                  'type', type, 'icon', icon, 'color', color) ORDER BY type, name), '[]')"""
+
+
+def get_categories(cashflow_id: Optional[str], request: Request, share_id: Optional[str] = None):
+    return get_collection("categories", "id", CATEGORIES_AGG, cashflow_id, request, share_id)
+
+
+def add_category(cashflow_id: str, category: CategoryBase):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """INSERT INTO categories (cashflow_id, name, type, icon, color)
+               VALUES (%s, %s, %s, %s, %s) RETURNING id""",
+            (
+                cashflow_id,
+                category.name,
+                category.type,
+                category.icon,
+                category.color,
+            ),
+        )
+        cat_id = cursor.fetchone()["id"]
+    return {"id": cat_id, "cashflow_id": cashflow_id, **category.model_dump()}
 
 
 @app.get("/api/cashflows/{cashflow_id}/categories")
 def list_categories(cashflow_id: str, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id)
-
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, cashflow_id, name, type, icon, color FROM categories WHERE cashflow_id = %s ORDER BY type, name",
-        (cashflow_id,),
-    )
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+    return get_categories(cashflow_id, request)
 
 
 @app.post("/api/cashflows/{cashflow_id}/categories", status_code=201)
 def create_category(cashflow_id: str, category: CategoryBase, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
+    return add_category(cashflow_id, category)
 
-    conn = get_db()
-    cursor = conn.cursor()
-    cat_id = str(uuid.uuid4())
-    cursor.execute(
-        "INSERT INTO categories (id, cashflow_id, name, type, icon, color) VALUES (%s, %s, %s, %s, %s, %s)",
-        (
-            cat_id,
-            cashflow_id,
-            category.name,
-            category.type,
-            category.icon,
-            category.color,
-        ),
-    )
-    conn.commit()
-    conn.close()
-    return {"id": cat_id, "cashflow_id": cashflow_id, **category.model_dump()}
 
+def encode_page_cursor(*key: str) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode()
 
-def get_plan_by_id(plan_id: str, conn=None):
-    should_close = conn is None
-    if conn is None:
-        conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        """SELECT p.id, p.cashflow_id, p.category_id, p.name, p.expected_amount, p.frequency,
+
+def decode_page_cursor(token: str, size: int) -> list:
+    try:
+        key = orjson.loads(base64.urlsafe_b64decode(token))
+    except ValueError:
+        key = None
+    if not isinstance(key, list) or len(key) != size or not all(isinstance(k, str) for k in key):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+MEMBER_JOIN = "JOIN cashflow_members m ON m.cashflow_id = p.cashflow_id AND m.user_id = %s"
+
+CATEGORY_JSON = """json_build_object(
+           'id', c.id, 'name', c.name, 'type', c.type, 'icon', c.icon, 'color', c.color)"""
+
+PLAN_COLUMNS = f"""p.id, p.cashflow_id, p.category_id, p.name, p.expected_amount, p.frequency,
            p.expected_day, p.start_month, p.end_month, p.status, p.notes,
-           p.created_at, p.updated_at,
-           c.id as cat_id, c.name as cat_name, c.type as cat_type, c.icon as cat_icon, c.color as cat_color
+           p.created_at, p.updated_at, {CATEGORY_JSON} AS category"""
+
+PLAN_JSON = f"""json_build_object(
+           'id', p.id, 'cashflow_id', p.cashflow_id, 'category_id', p.category_id, 'name', p.name,
+           'expected_amount', p.expected_amount, 'frequency', p.frequency, 'expected_day', p.expected_day,
+           'start_month', p.start_month, 'end_month', p.end_month, 'status', p.status, 'notes', p.notes,
+           'created_at', p.created_at, 'updated_at', p.updated_at, 'category', {CATEGORY_JSON})"""
+
+
+def get_plan_by_id(plan_id: str, cursor=None, versioned: bool = False):
+    if cursor is None:
+        with get_db() as conn:
+            return get_plan_by_id(plan_id, conn.cursor(), versioned)
+    version = ", p.xmin::text || '-' || c.xmin::text AS version" if versioned else ""
+    cursor.execute(
+        f"""SELECT {PLAN_COLUMNS}{version}
            FROM plans p JOIN categories c ON p.category_id = c.id
            WHERE p.id = %s""",
         (plan_id,),
     )
-    row = cursor.fetchone()
-    if should_close:
-        conn.close()
-    if not row:
-        return None
+    return cursor.fetchone()
 
-    return {
-        "id": row["id"],
-        "cashflow_id": row["cashflow_id"],
-        "category_id": row["category_id"],
-        "name": row["name"],
-        "expected_amount": row["expected_amount"],
-        "frequency": row["frequency"],
-        "expected_day": row["expected_day"],
-        "start_month": row["start_month"],
-        "end_month": row["end_month"],
-        "status": row["status"],
-        "notes": row["notes"],
-        "created_at": row["created_at"],
-        "updated_at": row["updated_at"],
-        "category": {
-            "id": row["cat_id"],
-            "name": row["cat_name"],
-            "type": row["cat_type"],
-            "icon": row["cat_icon"],
-            "color": row["cat_color"],
-        },
-    }
 
-
-@app.get("/api/cashflows/{cashflow_id}/plans")
-def list_plans(
-    cashflow_id: str,
-    request: Request,
-    status: Optional[str] = None,
-    category_id: Optional[str] = None,
+def get_plans(
+    cashflow_id: Optional[str],
+    status: Optional[List[str]] = None,
+    category_id: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    member_id: Optional[str] = None,
+    share_id: Optional[str] = None,
 ):
-    user_id = require_auth(request)
-    check_cashflow_access(user_id, cashflow_id)
+    with get_db() as conn:
+        cursor = conn.cursor()
+
+        query = f"""
+            SELECT {PLAN_JSON}::text AS plan, p.name, p.id
+            FROM plans p
+            JOIN categories c ON p.category_id = c.id
+            {MEMBER_JOIN if member_id else ""}
+            WHERE p.cashflow_id = {SHARED_CASHFLOW if share_id else "%s"}
+        """
+        params = [member_id, cashflow_id] if member_id else [share_id or cashflow_id]
+
+        if status == ["active"]:
+            query += " AND p.status = 'active'"
+        elif status:
+            query += " AND p.status = ANY(%s)"
+            params.append(status)
+        if category_id:
+            query += " AND p.category_id = ANY(%s)"
+            params.append(category_id)
+        if after:
+            query += " AND (p.name, p.id) > (%s, %s)"
+            params.extend(decode_page_cursor(after, 2))
+
+        query += " ORDER BY p.name, p.id"
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit + 1)
+
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+    if not rows and member_id:
+        check_cashflow_access(member_id, cashflow_id)
+    elif not rows and share_id:
+        get_public_cashflow(share_id)
+    if not limit:
+        items = ",".join(row["plan"] for row in rows)
+        return Response(f"[{items}]", media_type="application/json")
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_page_cursor(rows[-1]["name"], rows[-1]["id"])
+    items = ",".join(row["plan"] for row in rows)
+    body = f'{{"items":[{items}],"next_cursor":{orjson.dumps(next_cursor).decode()}}}'
+    return Response(body, media_type="application/json")
+
+
+def add_plan(cashflow_id: str, plan: PlanCreate):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        now = today_iso()
 
-    conn = get_db()
-    cursor = conn.cursor()
+        cursor.execute(
+            f"""WITH p AS (
+                   INSERT INTO plans (cashflow_id, category_id, name, expected_amount, frequency,
+                   expected_day, start_month, end_month, status, notes, created_at, updated_at)
+                   SELECT cashflow_id, id, %s, %s::real, %s, %s::integer, %s, %s, 'active', %s, %s, %s
+                   FROM categories WHERE id = %s AND cashflow_id = %s
+                   RETURNING *)
+               SELECT {PLAN_COLUMNS} FROM p JOIN categories c ON p.category_id = c.id""",
+            (
+                plan.name,
+                plan.expected_amount,
+                plan.frequency,
+                plan.expected_day,
+                plan.start_month,
+                plan.end_month,
+                plan.notes,
+                now,
+                now,
+                plan.category_id,
+                cashflow_id,
+            ),
+        )
+        result = cursor.fetchone()
 
-    query = """
-        SELECT p.id, p.cashflow_id, p.category_id, p.name, p.expected_amount, p.frequency,
-               p.expected_day, p.start_month, p.end_month, p.status, p.notes,
-               p.created_at, p.updated_at,
-               c.id as cat_id, c.name as cat_name, c.type as cat_type, c.icon as cat_icon, c.color as cat_color
-        FROM plans p
-        JOIN categories c ON p.category_id = c.id
-        WHERE p.cashflow_id = %s
-    """
-    params = [cashflow_id]
-
-    if status:
-        query += " AND p.status = %s"
-        params.append(status)
-    if category_id:
-        query += " AND p.category_id = %s"
-        params.append(category_id)
-
-    query += " ORDER BY p.name"
-
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
-
-    plans = []
-    for row in rows:
-        plans.append(
-            {
-                "id": row["id"],
-                "cashflow_id": row["cashflow_id"],
-                "category_id": row["category_id"],
-                "name": row["name"],
-                "expected_amount": row["expected_amount"],
-                "frequency": row["frequency"],
-                "expected_day": row["expected_day"],
-                "start_month": row["start_month"],
-                "end_month": row["end_month"],
-                "status": row["status"],
-                "notes": row["notes"],
-                "created_at": row["created_at"],
-                "updated_at": row["updated_at"],
-                "category": {
-                    "id": row["cat_id"],
-                    "name": row["cat_name"],
-                    "type": row["cat_type"],
-                    "icon": row["cat_icon"],
-                    "color": row["cat_color"],
-                },
-            }
+    if not result:
+        raise HTTPException(status_code=400, detail="Category not found")
+    return result
+
+
+def edit_plan(cashflow_id: str, plan_id: str, plan: PlanUpdate):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        now = today_iso()
+
+        fields = sorted(plan.model_fields_set)
+        updates = [f"{field} = %s" for field in fields]
+        params = [getattr(plan, field) for field in fields]
+
+        if updates:
+            updates.append("updated_at = %s")
+            params.extend([now, plan_id, cashflow_id])
+            cursor.execute(
+                f"""WITH p AS (
+                       UPDATE plans SET {', '.join(updates)}
+                       WHERE id = %s AND cashflow_id = %s
+                       RETURNING *)
+                   SELECT {PLAN_COLUMNS} FROM p JOIN categories c ON p.category_id = c.id""",
+                params,
+            )
+            result = cursor.fetchone()
+        else:
+            result = get_plan_by_id(plan_id, cursor)
+
+    if not result or result["cashflow_id"] != cashflow_id:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return result
+
+
+def remove_plan(cashflow_id: str, plan_id: str):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "DELETE FROM plans WHERE id = %s AND cashflow_id = %s", (plan_id, cashflow_id)
         )
+        deleted = cursor.rowcount
 
-    return plans
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Plan not found")
+
+
+@app.get("/api/cashflows/{cashflow_id}/plans")
+def list_plans(
+    cashflow_id: str,
+    request: Request,
+    status: Optional[List[str]] = Query(None),
+    category_id: Optional[List[str]] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
+    user_id = require_auth(request)
+    if after and not limit:
+        limit = PAGE_SIZE
+    return get_plans(cashflow_id, status, category_id, limit, after, member_id=user_id)
 
 
 @app.post("/api/cashflows/{cashflow_id}/plans", status_code=201)
 def create_plan(cashflow_id: str, plan: PlanCreate, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
-
-    conn = get_db()
-    cursor = conn.cursor()
-    plan_id = str(uuid.uuid4())
-    now = date.today().isoformat()
-
-    cursor.execute(
-        """INSERT INTO plans (id, cashflow_id, category_id, name, expected_amount, frequency,
-           expected_day, start_month, end_month, status, notes, created_at, updated_at)
-           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'active', %s, %s, %s)""",
-        (
-            plan_id,
-            cashflow_id,
-            plan.category_id,
-            plan.name,
-            plan.expected_amount,
-            plan.frequency,
-            plan.expected_day,
-            plan.start_month,
-            plan.end_month,
-            plan.notes,
-            now,
-            now,
-        ),
-    )
-    conn.commit()
-    result = get_plan_by_id(plan_id, conn)
-    conn.close()
-    return result
+    return add_plan(cashflow_id, plan)
 
 
 @app.get("/api/cashflows/{cashflow_id}/plans/{plan_id}")
@@ -1084,152 +1293,69 @@ def get_plan(cashflow_id: str, plan_id: str, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id)
 
-    plan = get_plan_by_id(plan_id)
+    plan = get_plan_by_id(plan_id, versioned=True)
     if not plan or plan["cashflow_id"] != cashflow_id:
         raise HTTPException(status_code=404, detail="Plan not found")
-    return plan
+    return etag_response(plan, request)
 
 
 @app.put("/api/cashflows/{cashflow_id}/plans/{plan_id}")
 def update_plan(cashflow_id: str, plan_id: str, plan: PlanUpdate, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
+    return edit_plan(cashflow_id, plan_id, plan)
 
-    conn = get_db()
-    cursor = conn.cursor()
-    now = date.today().isoformat()
 
-    cursor.execute(
-        "SELECT id FROM plans WHERE id = %s AND cashflow_id = %s", (plan_id, cashflow_id)
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(status_code=404, detail="Plan not found")
-
-    updates = []
-    params = []
-    data = plan.model_dump(exclude_unset=True)
-
-    for key, value in data.items():
-        updates.append(f"{key} = %s")
-        params.append(value)
-
-    if updates:
-        updates.append("updated_at = %s")
-        params.append(now)
-        params.append(plan_id)
-
-        cursor.execute(f"UPDATE plans SET {', '.join(updates)} WHERE id = %s", params)
-        conn.commit()
-
-    result = get_plan_by_id(plan_id, conn)
-    conn.close()
-    return result
-
-
-@app.delete("/api/cashflows/{cashflow_id}/plans/{plan_id}", status_code=204)
+@app.delete("/api/cashflows/{cashflow_id}/plans/{plan_id}", status_code=204, response_class=Response)
 def delete_plan(cashflow_id: str, plan_id: str, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
+    remove_plan(cashflow_id, plan_id)
+    return Response(status_code=204)
 
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id FROM plans WHERE id = %s AND cashflow_id = %s", (plan_id, cashflow_id)
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(status_code=404, detail="Plan not found")
 
-    cursor.execute("DELETE FROM entries WHERE plan_id = %s", (plan_id,))
-    cursor.execute("DELETE FROM plans WHERE id = %s", (plan_id,))
-    conn.commit()
-    conn.close()
+ENTRY_COLUMNS = f"""e.id, e.plan_id, e.month_year, e.amount, e.date, e.notes, e.created_at,
+           {PLAN_JSON} AS plan"""
 
+ENTRY_JSON = f"""json_build_object(
+           'id', e.id, 'plan_id', e.plan_id, 'month_year', e.month_year, 'amount', e.amount,
+           'date', e.date, 'notes', e.notes, 'created_at', e.created_at, 'plan', {PLAN_JSON})"""
 
-def get_entry_by_id(entry_id: str, conn=None):
-    should_close = conn is None
-    if conn is None:
-        conn = get_db()
-    cursor = conn.cursor()
+
+def get_entry_by_id(entry_id: str, cursor=None, versioned: bool = False):
+    if cursor is None:
+        with get_db() as conn:
+            return get_entry_by_id(entry_id, conn.cursor(), versioned)
+    version = (
+        ", e.xmin::text || '-' || p.xmin::text || '-' || c.xmin::text AS version" if versioned else ""
+    )
     cursor.execute(
-        """SELECT e.id, e.plan_id, e.month_year, e.amount, e.date, e.notes, e.created_at,
-           p.id as p_id, p.cashflow_id, p.category_id, p.name as plan_name, p.expected_amount,
-           p.frequency, p.expected_day, p.start_month, p.end_month, p.status as plan_status,
-           p.notes as plan_notes, p.created_at as plan_created_at, p.updated_at as plan_updated_at,
-           c.id as cat_id, c.name as cat_name, c.type as cat_type, c.icon as cat_icon, c.color as cat_color
+        f"""SELECT {ENTRY_COLUMNS}, p.cashflow_id{version}
            FROM entries e
            JOIN plans p ON e.plan_id = p.id
            JOIN categories c ON p.category_id = c.id
            WHERE e.id = %s""",
         (entry_id,),
     )
-    row = cursor.fetchone()
-    if should_close:
-        conn.close()
-    if not row:
-        return None
-
-    return {
-        "id": row["id"],
-        "plan_id": row["plan_id"],
-        "month_year": row["month_year"],
-        "amount": row["amount"],
-        "date": row["date"],
-        "notes": row["notes"],
-        "created_at": row["created_at"],
-        "cashflow_id": row["cashflow_id"],
-        "plan": {
-            "id": row["p_id"],
-            "cashflow_id": row["cashflow_id"],
-            "category_id": row["category_id"],
-            "name": row["plan_name"],
-            "expected_amount": row["expected_amount"],
-            "frequency": row["frequency"],
-            "expected_day": row["expected_day"],
-            "start_month": row["start_month"],
-            "end_month": row["end_month"],
-            "status": row["plan_status"],
-            "notes": row["plan_notes"],
-            "created_at": row["plan_created_at"],
-            "updated_at": row["plan_updated_at"],
-            "category": {
-                "id": row["cat_id"],
-                "name": row["cat_name"],
-                "type": row["cat_type"],
-                "icon": row["cat_icon"],
-                "color": row["cat_color"],
-            },
-        },
-    }
+    return cursor.fetchone()
 
 
-@app.get("/api/cashflows/{cashflow_id}/entries")
-def list_entries(
-    cashflow_id: str,
-    request: Request,
-    from_month: Optional[str] = None,
-    to_month: Optional[str] = None,
-    plan_id: Optional[str] = None,
+def entries_filter(
+    cashflow_id: Optional[str],
+    from_month: Optional[str],
+    to_month: Optional[str],
+    plan_id: Optional[List[str]],
+    member_id: Optional[str],
+    share_id: Optional[str],
 ):
-    user_id = require_auth(request)
-    check_cashflow_access(user_id, cashflow_id)
-
-    conn = get_db()
-    cursor = conn.cursor()
-
-    query = """
-        SELECT e.id, e.plan_id, e.month_year, e.amount, e.date, e.notes, e.created_at,
-               p.id as p_id, p.cashflow_id, p.category_id, p.name as plan_name, p.expected_amount,
-               p.frequency, p.expected_day, p.start_month, p.end_month, p.status as plan_status,
-               p.notes as plan_notes, p.created_at as plan_created_at, p.updated_at as plan_updated_at,
-               c.id as cat_id, c.name as cat_name, c.type as cat_type, c.icon as cat_icon, c.color as cat_color
+    query = f"""
         FROM entries e
         JOIN plans p ON e.plan_id = p.id
         JOIN categories c ON p.category_id = c.id
-        WHERE p.cashflow_id = %s
+        {MEMBER_JOIN if member_id else ""}
+        WHERE p.cashflow_id = {SHARED_CASHFLOW if share_id else "%s"}
     """
-    params = [cashflow_id]
+    params = [member_id, cashflow_id] if member_id else [share_id or cashflow_id]
 
     if from_month:
         query += " AND e.month_year >= %s"
@@ -1238,209 +1364,299 @@ def list_entries(
         query += " AND e.month_year <= %s"
         params.append(to_month)
     if plan_id:
-        query += " AND e.plan_id = %s"
+        query += " AND e.plan_id = ANY(%s)"
         params.append(plan_id)
 
-    query += " ORDER BY e.month_year, e.created_at"
-
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
-
-    entries = []
-    for row in rows:
-        entries.append(
-            {
-                "id": row["id"],
-                "plan_id": row["plan_id"],
-                "month_year": row["month_year"],
-                "amount": row["amount"],
-                "date": row["date"],
-                "notes": row["notes"],
-                "created_at": row["created_at"],
-                "plan": {
-                    "id": row["p_id"],
-                    "cashflow_id": row["cashflow_id"],
-                    "category_id": row["category_id"],
-                    "name": row["plan_name"],
-                    "expected_amount": row["expected_amount"],
-                    "frequency": row["frequency"],
-                    "expected_day": row["expected_day"],
-                    "start_month": row["start_month"],
-                    "end_month": row["end_month"],
-                    "status": row["plan_status"],
-                    "notes": row["plan_notes"],
-                    "created_at": row["plan_created_at"],
-                    "updated_at": row["plan_updated_at"],
-                    "category": {
-                        "id": row["cat_id"],
-                        "name": row["cat_name"],
-                        "type": row["cat_type"],
-                        "icon": row["cat_icon"],
-                        "color": row["cat_color"],
-                    },
-                },
-            }
+    return query, params
+
+
+def get_entries(
+    cashflow_id: Optional[str],
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    plan_id: Optional[List[str]] = None,
+    member_id: Optional[str] = None,
+    share_id: Optional[str] = None,
+):
+    query, params = entries_filter(cashflow_id, from_month, to_month, plan_id, member_id, share_id)
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""SELECT COALESCE(json_agg({ENTRY_JSON}
+                   ORDER BY e.month_year, e.created_at, e.id), '[]')::text AS body {query}""",
+            params,
         )
+        body = cursor.fetchone()["body"]
 
-    return entries
+    if body == "[]" and member_id:
+        check_cashflow_access(member_id, cashflow_id)
+    elif body == "[]" and share_id:
+        get_public_cashflow(share_id)
 
+    return Response(body, media_type="application/json")
 
-@app.post("/api/cashflows/{cashflow_id}/entries", status_code=201)
-def create_entry(cashflow_id: str, entry: EntryCreate, request: Request):
-    user_id = require_auth(request)
-    check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
 
-    conn = get_db()
-    cursor = conn.cursor()
-    entry_id = str(uuid.uuid4())
-    now = date.today().isoformat()
+def page_entries(
+    cashflow_id: Optional[str],
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    plan_id: Optional[List[str]] = None,
+    limit: int = PAGE_SIZE,
+    after: Optional[str] = None,
+    member_id: Optional[str] = None,
+    share_id: Optional[str] = None,
+):
+    query, params = entries_filter(cashflow_id, from_month, to_month, plan_id, member_id, share_id)
+    if after:
+        query += " AND (e.month_year, e.created_at, e.id) > (%s, %s, %s)"
+        params.extend(decode_page_cursor(after, 3))
+    params.append(limit + 1)
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""SELECT {ENTRY_JSON}::text AS entry, e.month_year, e.created_at, e.id {query}
+               ORDER BY e.month_year, e.created_at, e.id LIMIT %s""",
+            params,
+        )
+        rows = cursor.fetchall()
 
-    cursor.execute(
-        "SELECT id, frequency FROM plans WHERE id = %s AND cashflow_id = %s",
-        (entry.plan_id, cashflow_id),
-    )
-    plan_row = cursor.fetchone()
-    if not plan_row:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Plan not found")
+    if not rows and member_id:
+        check_cashflow_access(member_id, cashflow_id)
+    elif not rows and share_id:
+        get_public_cashflow(share_id)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_page_cursor(last["month_year"], last["created_at"], last["id"])
+
+    items = ",".join(row["entry"] for row in rows)
+    body = f'{{"items":[{items}],"next_cursor":{orjson.dumps(next_cursor).decode()}}}'
+    return Response(body, media_type="application/json")
 
-    cursor.execute(
-        """INSERT INTO entries (id, plan_id, month_year, amount, date, notes, created_at)
-           VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-        (
-            entry_id,
-            entry.plan_id,
-            entry.month_year,
-            entry.amount,
-            entry.date,
-            entry.notes,
-            now,
-        ),
-    )
 
-    if plan_row["frequency"] == "one-time":
+def add_entry(cashflow_id: str, entry: EntryCreate):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        now = today_iso()
+
         cursor.execute(
-            "UPDATE plans SET status = 'completed', updated_at = %s WHERE id = %s",
-            (now, entry.plan_id),
+            f"""WITH e AS (
+                   INSERT INTO entries (plan_id, month_year, amount, date, notes, created_at)
+                   SELECT id, %s, %s::real, %s, %s, %s
+                   FROM plans WHERE id = %s AND cashflow_id = %s
+                   RETURNING *),
+               completed AS (
+                   UPDATE plans SET status = 'completed', updated_at = %s
+                   WHERE id IN (SELECT plan_id FROM e) AND frequency = 'one-time')
+               SELECT {ENTRY_COLUMNS}, p.cashflow_id
+               FROM e
+               JOIN plans p ON e.plan_id = p.id
+               JOIN categories c ON p.category_id = c.id""",
+            (
+                entry.month_year,
+                entry.amount,
+                entry.date,
+                entry.notes,
+                now,
+                entry.plan_id,
+                cashflow_id,
+                now,
+            ),
         )
+        result = cursor.fetchone()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    if result["plan"]["frequency"] == "one-time":
+        result["plan"].update(status="completed", updated_at=now)
+    return result
+
+
+def edit_entry(cashflow_id: str, entry_id: str, entry: EntryUpdate):
+    with get_db() as conn:
+        cursor = conn.cursor()
+
+        fields = sorted(entry.model_fields_set)
+        updates = [f"{field} = %s" for field in fields]
+        params = [getattr(entry, field) for field in fields]
+
+        if updates:
+            params.extend([entry_id, cashflow_id])
+            cursor.execute(
+                f"""WITH e AS (
+                       UPDATE entries SET {', '.join(updates)}
+                       WHERE id = %s AND plan_id IN (SELECT id FROM plans WHERE cashflow_id = %s)
+                       RETURNING *)
+                   SELECT {ENTRY_COLUMNS}, p.cashflow_id
+                   FROM e
+                   JOIN plans p ON e.plan_id = p.id
+                   JOIN categories c ON p.category_id = c.id""",
+                params,
+            )
+            result = cursor.fetchone()
+        else:
+            result = get_entry_by_id(entry_id, cursor)
 
-    conn.commit()
-    result = get_entry_by_id(entry_id, conn)
-    conn.close()
+    if not result or result["cashflow_id"] != cashflow_id:
+        raise HTTPException(status_code=404, detail="Entry not found")
     return result
 
 
+def remove_entry(cashflow_id: str, entry_id: str):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """DELETE FROM entries
+               WHERE id = %s AND plan_id IN (SELECT id FROM plans WHERE cashflow_id = %s)""",
+            (entry_id, cashflow_id),
+        )
+        deleted = cursor.rowcount
+
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Entry not found")
+
+
+ENTRY_FIELD_TYPES = {"amount": "float8", "date": "text", "notes": "text"}
+
+
+def edit_entries(cashflow_id: str, entries: List[EntryBulkUpdate]):
+    changes = {}
+    for entry in entries:
+        changes.setdefault(entry.id, {}).update(
+            (field, getattr(entry, field)) for field in entry.model_fields_set if field != "id"
+        )
+
+    groups = {}
+    for entry_id, data in changes.items():
+        groups.setdefault(tuple(sorted(data)), []).append((entry_id, data))
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+
+        with conn.transaction():
+            for fields, group in groups.items():
+                if not fields:
+                    continue
+                updates = ", ".join(f"{field} = v.{field}" for field in fields)
+                arrays = ", ".join(f"%s::{ENTRY_FIELD_TYPES[field]}[]" for field in fields)
+                params = [[entry_id for entry_id, _ in group]]
+                params.extend([data[field] for _, data in group] for field in fields)
+                params.append(cashflow_id)
+                cursor.execute(
+                    f"""UPDATE entries SET {updates}
+                       FROM unnest(%s::text[], {arrays}) AS v(id, {', '.join(fields)})
+                       WHERE entries.id = v.id
+                         AND entries.plan_id IN (SELECT id FROM plans WHERE cashflow_id = %s)""",
+                    params,
+                )
+
+            cursor.execute(
+                f"""SELECT {ENTRY_COLUMNS}
+                   FROM entries e
+                   JOIN plans p ON e.plan_id = p.id
+                   JOIN categories c ON p.category_id = c.id
+                   WHERE p.cashflow_id = %s AND e.id = ANY(%s)
+                   ORDER BY e.month_year, e.created_at, e.id""",
+                (cashflow_id, list(changes)),
+            )
+            rows = cursor.fetchall()
+            if len(rows) != len(changes):
+                raise HTTPException(status_code=404, detail="Entry not found")
+
+    return ORJSONResponse(rows)
+
+
+@app.get("/api/cashflows/{cashflow_id}/entries")
+def list_entries(
+    cashflow_id: str,
+    request: Request,
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    plan_id: Optional[List[str]] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
+    user_id = require_auth(request)
+    if limit or after:
+        return page_entries(
+            cashflow_id, from_month, to_month, plan_id, limit or PAGE_SIZE, after, member_id=user_id
+        )
+    return get_entries(cashflow_id, from_month, to_month, plan_id, member_id=user_id)
+
+
+@app.post("/api/cashflows/{cashflow_id}/entries", status_code=201)
+def create_entry(cashflow_id: str, entry: EntryCreate, request: Request):
+    user_id = require_auth(request)
+    check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
+    return add_entry(cashflow_id, entry)
+
+
 @app.get("/api/cashflows/{cashflow_id}/entries/{entry_id}")
 def get_entry(cashflow_id: str, entry_id: str, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id)
 
-    entry = get_entry_by_id(entry_id)
+    entry = get_entry_by_id(entry_id, versioned=True)
     if not entry or entry["cashflow_id"] != cashflow_id:
         raise HTTPException(status_code=404, detail="Entry not found")
-    return entry
+    return etag_response(entry, request)
 
 
 @app.put("/api/cashflows/{cashflow_id}/entries/{entry_id}")
 def update_entry(cashflow_id: str, entry_id: str, entry: EntryUpdate, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
+    return edit_entry(cashflow_id, entry_id, entry)
 
-    conn = get_db()
-    cursor = conn.cursor()
 
-    cursor.execute(
-        """SELECT e.id FROM entries e
-           JOIN plans p ON e.plan_id = p.id
-           WHERE e.id = %s AND p.cashflow_id = %s""",
-        (entry_id, cashflow_id),
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(status_code=404, detail="Entry not found")
+@app.patch("/api/cashflows/{cashflow_id}/entries")
+def update_entries(cashflow_id: str, entries: List[EntryBulkUpdate], request: Request):
+    user_id = require_auth(request)
+    check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
+    return edit_entries(cashflow_id, entries)
 
-    updates = []
-    params = []
-    data = entry.model_dump(exclude_unset=True)
 
-    for key, value in data.items():
-        updates.append(f"{key} = %s")
-        params.append(value)
+@app.delete("/api/cashflows/{cashflow_id}/entries/{entry_id}", status_code=204, response_class=Response)
+def delete_entry(cashflow_id: str, entry_id: str, request: Request):
+    user_id = require_auth(request)
+    check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
+    remove_entry(cashflow_id, entry_id)
+    return Response(status_code=204)
 
-    if updates:
-        params.append(entry_id)
-        cursor.execute(f"UPDATE entries SET {', '.join(updates)} WHERE id = %s", params)
-        conn.commit()
 
-    result = get_entry_by_id(entry_id, conn)
-    conn.close()
-    return result
+SETTINGS_AGG = """COALESCE(json_agg(json_build_object('key', key, 'value', value) ORDER BY key), '[]')"""
 
 
-@app.delete("/api/cashflows/{cashflow_id}/entries/{entry_id}", status_code=204)
-def delete_entry(cashflow_id: str, entry_id: str, request: Request):
-    user_id = require_auth(request)
-    check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
+def get_settings(cashflow_id: Optional[str], request: Request, share_id: Optional[str] = None):
+    return get_collection("settings", "key", SETTINGS_AGG, cashflow_id, request, share_id)
 
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        """SELECT e.id FROM entries e
-           JOIN plans p ON e.plan_id = p.id
-           WHERE e.id = %s AND p.cashflow_id = %s""",
-        (entry_id, cashflow_id),
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(status_code=404, detail="Entry not found")
 
-    cursor.execute("DELETE FROM entries WHERE id = %s", (entry_id,))
-    conn.commit()
-    conn.close()
+def save_setting(cashflow_id: str, key: str, value: str):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"{INSERT_SETTING} ON CONFLICT (cashflow_id, key) DO UPDATE SET value = EXCLUDED.value",
+            (cashflow_id, key, value),
+        )
+    return {"key": key, "value": value}
 
 
 @app.get("/api/cashflows/{cashflow_id}/settings")
 def list_settings(cashflow_id: str, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id)
-
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT key, value FROM settings WHERE cashflow_id = %s", (cashflow_id,)
-    )
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+    return get_settings(cashflow_id, request)
 
 
 @app.put("/api/cashflows/{cashflow_id}/settings/{key}")
 def update_setting(cashflow_id: str, key: str, setting: dict, request: Request):
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id, ["owner", "editor"])
-
-    conn = get_db()
-    cursor = conn.cursor()
-    value = setting["value"]
-
-    cursor.execute(
-        "SELECT key FROM settings WHERE cashflow_id = %s AND key = %s", (cashflow_id, key)
-    )
-    if cursor.fetchone():
-        cursor.execute(
-            "UPDATE settings SET value = %s WHERE cashflow_id = %s AND key = %s",
-            (value, cashflow_id, key),
-        )
-    else:
-        cursor.execute(
-            "INSERT INTO settings (cashflow_id, key, value) VALUES (%s, %s, %s)",
-            (cashflow_id, key, value),
-        )
-
-    conn.commit()
-    conn.close()
-    return {"key": key, "value": value}
+    return save_setting(cashflow_id, key, setting["value"])
 
 
 @app.put("/api/cashflows/{cashflow_id}/share")
@@ -1450,46 +1666,34 @@ def update_share_settings(
     user_id = require_auth(request)
     check_cashflow_access(user_id, cashflow_id, ["owner"])
 
-    conn = get_db()
-    cursor = conn.cursor()
-    now = datetime.utcnow().isoformat()
-
-    cursor.execute(
-        "UPDATE cashflows SET is_public = %s, updated_at = %s WHERE id = %s",
-        (1 if settings.is_public else 0, now, cashflow_id),
-    )
-    conn.commit()
+    with get_db() as conn:
+        cursor = conn.cursor()
+        now = datetime.utcnow().isoformat()
 
-    cursor.execute(
-        "SELECT id, name, description, owner_id, share_id, is_public, created_at, updated_at FROM cashflows WHERE id = %s",
-        (cashflow_id,),
-    )
-    row = cursor.fetchone()
-    conn.close()
+        cursor.execute(
+            f"UPDATE cashflows SET is_public = %s, updated_at = %s WHERE id = %s RETURNING {CASHFLOW_COLUMNS}",
+            (1 if settings.is_public else 0, now, cashflow_id),
+        )
+        row = cursor.fetchone()
 
-    result = dict(row)
-    result["role"] = "owner"
-    result["is_public"] = bool(result["is_public"])
-    return result
+    row["role"] = "owner"
+    row["is_public"] = bool(row["is_public"])
+    return row
 
 
 def get_public_cashflow(share_id: str):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, name, description, owner_id, share_id, is_public, created_at, updated_at FROM cashflows WHERE share_id = %s",
-        (share_id,),
-    )
-    row = cursor.fetchone()
-    conn.close()
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT {CASHFLOW_COLUMNS} FROM cashflows WHERE share_id = %s AND is_public = 1",
+            (share_id,),
+        )
+        row = cursor.fetchone()
 
     if not row:
         raise HTTPException(status_code=404, detail="Cashflow not found")
 
-    if not row["is_public"]:
-        raise HTTPException(status_code=404, detail="Cashflow not found")
-
-    return dict(row)
+    return row
 
 
 @app.get("/api/public/{share_id}")
@@ -1507,199 +1711,46 @@ def get_public_cashflow_details(share_id: str):
 
 
 @app.get("/api/public/{share_id}/categories")
-def list_public_categories(share_id: str):
-    cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, cashflow_id, name, type, icon, color FROM categories WHERE cashflow_id = %s ORDER BY type, name",
-        (cashflow_id,),
-    )
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+def list_public_categories(share_id: str, request: Request):
+    return get_categories(None, request, share_id)
 
 
 @app.post("/api/public/{share_id}/categories", status_code=201)
 def create_public_category(share_id: str, category: CategoryBase):
     cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-    cat_id = str(uuid.uuid4())
-    cursor.execute(
-        "INSERT INTO categories (id, cashflow_id, name, type, icon, color) VALUES (%s, %s, %s, %s, %s, %s)",
-        (
-            cat_id,
-            cashflow_id,
-            category.name,
-            category.type,
-            category.icon,
-            category.color,
-        ),
-    )
-    conn.commit()
-    conn.close()
-    return {"id": cat_id, "cashflow_id": cashflow_id, **category.model_dump()}
+    return add_category(cashflow["id"], category)
 
 
 @app.get("/api/public/{share_id}/plans")
 def list_public_plans(
-    share_id: str, status: Optional[str] = None, category_id: Optional[str] = None
+    share_id: str,
+    status: Optional[List[str]] = Query(None),
+    category_id: Optional[List[str]] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
 ):
-    cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-
-    query = """
-        SELECT p.id, p.cashflow_id, p.category_id, p.name, p.expected_amount, p.frequency,
-               p.expected_day, p.start_month, p.end_month, p.status, p.notes,
-               p.created_at, p.updated_at,
-               c.id as cat_id, c.name as cat_name, c.type as cat_type, c.icon as cat_icon, c.color as cat_color
-        FROM plans p
-        JOIN categories c ON p.category_id = c.id
-        WHERE p.cashflow_id = %s
-    """
-    params = [cashflow_id]
-
-    if status:
-        query += " AND p.status = %s"
-        params.append(status)
-    if category_id:
-        query += " AND p.category_id = %s"
-        params.append(category_id)
-
-    query += " ORDER BY p.name"
-
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
-
-    plans = []
-    for row in rows:
-        plans.append(
-            {
-                "id": row["id"],
-                "cashflow_id": row["cashflow_id"],
-                "category_id": row["category_id"],
-                "name": row["name"],
-                "expected_amount": row["expected_amount"],
-                "frequency": row["frequency"],
-                "expected_day": row["expected_day"],
-                "start_month": row["start_month"],
-                "end_month": row["end_month"],
-                "status": row["status"],
-                "notes": row["notes"],
-                "created_at": row["created_at"],
-                "updated_at": row["updated_at"],
-                "category": {
-                    "id": row["cat_id"],
-                    "name": row["cat_name"],
-                    "type": row["cat_type"],
-                    "icon": row["cat_icon"],
-                    "color": row["cat_color"],
-                },
-            }
-        )
-
-    return plans
+    if after and not limit:
+        limit = PAGE_SIZE
+    return get_plans(None, status, category_id, limit, after, share_id=share_id)
 
 
 @app.post("/api/public/{share_id}/plans", status_code=201)
 def create_public_plan(share_id: str, plan: PlanCreate):
     cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-    plan_id = str(uuid.uuid4())
-    now = date.today().isoformat()
-
-    cursor.execute(
-        """INSERT INTO plans (id, cashflow_id, category_id, name, expected_amount, frequency,
-           expected_day, start_month, end_month, status, notes, created_at, updated_at)
-           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'active', %s, %s, %s)""",
-        (
-            plan_id,
-            cashflow_id,
-            plan.category_id,
-            plan.name,
-            plan.expected_amount,
-            plan.frequency,
-            plan.expected_day,
-            plan.start_month,
-            plan.end_month,
-            plan.notes,
-            now,
-            now,
-        ),
-    )
-    conn.commit()
-    result = get_plan_by_id(plan_id, conn)
-    conn.close()
-    return result
+    return add_plan(cashflow["id"], plan)
 
 
 @app.put("/api/public/{share_id}/plans/{plan_id}")
 def update_public_plan(share_id: str, plan_id: str, plan: PlanUpdate):
     cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
+    return edit_plan(cashflow["id"], plan_id, plan)
 
-    conn = get_db()
-    cursor = conn.cursor()
-    now = date.today().isoformat()
 
-    cursor.execute(
-        "SELECT id FROM plans WHERE id = %s AND cashflow_id = %s", (plan_id, cashflow_id)
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(status_code=404, detail="Plan not found")
-
-    updates = []
-    params = []
-    data = plan.model_dump(exclude_unset=True)
-
-    for key, value in data.items():
-        updates.append(f"{key} = %s")
-        params.append(value)
-
-    if updates:
-        updates.append("updated_at = %s")
-        params.append(now)
-        params.append(plan_id)
-
-        cursor.execute(f"UPDATE plans SET {', '.join(updates)} WHERE id = %s", params)
-        conn.commit()
-
-    result = get_plan_by_id(plan_id, conn)
-    conn.close()
-    return result
-
-
-@app.delete("/api/public/{share_id}/plans/{plan_id}", status_code=204)
+@app.delete("/api/public/{share_id}/plans/{plan_id}", status_code=204, response_class=Response)
 def delete_public_plan(share_id: str, plan_id: str):
     cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id FROM plans WHERE id = %s AND cashflow_id = %s", (plan_id, cashflow_id)
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(status_code=404, detail="Plan not found")
-
-    cursor.execute("DELETE FROM entries WHERE plan_id = %s", (plan_id,))
-    cursor.execute("DELETE FROM plans WHERE id = %s", (plan_id,))
-    conn.commit()
-    conn.close()
+    remove_plan(cashflow["id"], plan_id)
+    return Response(status_code=204)
 
 
 @app.get("/api/public/{share_id}/entries")
@@ -1707,232 +1758,57 @@ def list_public_entries(
     share_id: str,
     from_month: Optional[str] = None,
     to_month: Optional[str] = None,
-    plan_id: Optional[str] = None,
+    plan_id: Optional[List[str]] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
 ):
-    cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-
-    query = """
-        SELECT e.id, e.plan_id, e.month_year, e.amount, e.date, e.notes, e.created_at,
-               p.id as p_id, p.cashflow_id, p.category_id, p.name as plan_name, p.expected_amount,
-               p.frequency, p.expected_day, p.start_month, p.end_month, p.status as plan_status,
-               p.notes as plan_notes, p.created_at as plan_created_at, p.updated_at as plan_updated_at,
-               c.id as cat_id, c.name as cat_name, c.type as cat_type, c.icon as cat_icon, c.color as cat_color
-        FROM entries e
-        JOIN plans p ON e.plan_id = p.id
-        JOIN categories c ON p.category_id = c.id
-        WHERE p.cashflow_id = %s
-    """
-    params = [cashflow_id]
-
-    if from_month:
-        query += " AND e.month_year >= %s"
-        params.append(from_month)
-    if to_month:
-        query += " AND e.month_year <= %s"
-        params.append(to_month)
-    if plan_id:
-        query += " AND e.plan_id = %s"
-        params.append(plan_id)
-
-    query += " ORDER BY e.month_year, e.created_at"
-
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
-
-    entries = []
-    for row in rows:
-        entries.append(
-            {
-                "id": row["id"],
-                "plan_id": row["plan_id"],
-                "month_year": row["month_year"],
-                "amount": row["amount"],
-                "date": row["date"],
-                "notes": row["notes"],
-                "created_at": row["created_at"],
-                "plan": {
-                    "id": row["p_id"],
-                    "cashflow_id": row["cashflow_id"],
-                    "category_id": row["category_id"],
-                    "name": row["plan_name"],
-                    "expected_amount": row["expected_amount"],
-                    "frequency": row["frequency"],
-                    "expected_day": row["expected_day"],
-                    "start_month": row["start_month"],
-                    "end_month": row["end_month"],
-                    "status": row["plan_status"],
-                    "notes": row["plan_notes"],
-                    "created_at": row["plan_created_at"],
-                    "updated_at": row["plan_updated_at"],
-                    "category": {
-                        "id": row["cat_id"],
-                        "name": row["cat_name"],
-                        "type": row["cat_type"],
-                        "icon": row["cat_icon"],
-                        "color": row["cat_color"],
-                    },
-                },
-            }
+    if limit or after:
+        return page_entries(
+            None, from_month, to_month, plan_id, limit or PAGE_SIZE, after, share_id=share_id
         )
-
-    return entries
+    return get_entries(None, from_month, to_month, plan_id, share_id=share_id)
 
 
 @app.post("/api/public/{share_id}/entries", status_code=201)
 def create_public_entry(share_id: str, entry: EntryCreate):
     cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-    entry_id = str(uuid.uuid4())
-    now = date.today().isoformat()
-
-    cursor.execute(
-        "SELECT id, frequency FROM plans WHERE id = %s AND cashflow_id = %s",
-        (entry.plan_id, cashflow_id),
-    )
-    plan_row = cursor.fetchone()
-    if not plan_row:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Plan not found")
-
-    cursor.execute(
-        """INSERT INTO entries (id, plan_id, month_year, amount, date, notes, created_at)
-           VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-        (
-            entry_id,
-            entry.plan_id,
-            entry.month_year,
-            entry.amount,
-            entry.date,
-            entry.notes,
-            now,
-        ),
-    )
-
-    if plan_row["frequency"] == "one-time":
-        cursor.execute(
-            "UPDATE plans SET status = 'completed', updated_at = %s WHERE id = %s",
-            (now, entry.plan_id),
-        )
-
-    conn.commit()
-    result = get_entry_by_id(entry_id, conn)
-    conn.close()
-    return result
+    return add_entry(cashflow["id"], entry)
 
 
 @app.put("/api/public/{share_id}/entries/{entry_id}")
 def update_public_entry(share_id: str, entry_id: str, entry: EntryUpdate):
     cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """SELECT e.id FROM entries e
-           JOIN plans p ON e.plan_id = p.id
-           WHERE e.id = %s AND p.cashflow_id = %s""",
-        (entry_id, cashflow_id),
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(status_code=404, detail="Entry not found")
-
-    updates = []
-    params = []
-    data = entry.model_dump(exclude_unset=True)
+    return edit_entry(cashflow["id"], entry_id, entry)
 
-    for key, value in data.items():
-        updates.append(f"{key} = %s")
-        params.append(value)
 
-    if updates:
-        params.append(entry_id)
-        cursor.execute(f"UPDATE entries SET {', '.join(updates)} WHERE id = %s", params)
-        conn.commit()
-
-    result = get_entry_by_id(entry_id, conn)
-    conn.close()
-    return result
+@app.patch("/api/public/{share_id}/entries")
+def update_public_entries(share_id: str, entries: List[EntryBulkUpdate]):
+    cashflow = get_public_cashflow(share_id)
+    return edit_entries(cashflow["id"], entries)
 
 
-@app.delete("/api/public/{share_id}/entries/{entry_id}", status_code=204)
+@app.delete("/api/public/{share_id}/entries/{entry_id}", status_code=204, response_class=Response)
 def delete_public_entry(share_id: str, entry_id: str):
     cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        """SELECT e.id FROM entries e
-           JOIN plans p ON e.plan_id = p.id
-           WHERE e.id = %s AND p.cashflow_id = %s""",
-        (entry_id, cashflow_id),
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(status_code=404, detail="Entry not found")
-
-    cursor.execute("DELETE FROM entries WHERE id = %s", (entry_id,))
-    conn.commit()
-    conn.close()
+    remove_entry(cashflow["id"], entry_id)
+    return Response(status_code=204)
 
 
 @app.get("/api/public/{share_id}/settings")
-def list_public_settings(share_id: str):
-    cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT key, value FROM settings WHERE cashflow_id = %s", (cashflow_id,)
-    )
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+def list_public_settings(share_id: str, request: Request):
+    return get_settings(None, request, share_id)
 
 
 @app.put("/api/public/{share_id}/settings/{key}")
 def update_public_setting(share_id: str, key: str, setting: dict):
     cashflow = get_public_cashflow(share_id)
-    cashflow_id = cashflow["id"]
-
-    conn = get_db()
-    cursor = conn.cursor()
-    value = setting["value"]
-
-    cursor.execute(
-        "SELECT key FROM settings WHERE cashflow_id = %s AND key = %s", (cashflow_id, key)
-    )
-    if cursor.fetchone():
-        cursor.execute(
-            "UPDATE settings SET value = %s WHERE cashflow_id = %s AND key = %s",
-            (value, cashflow_id, key),
-        )
-    else:
-        cursor.execute(
-            "INSERT INTO settings (cashflow_id, key, value) VALUES (%s, %s, %s)",
-            (cashflow_id, key, value),
-        )
-
-    conn.commit()
-    conn.close()
-    return {"key": key, "value": value}
+    return save_setting(cashflow["id"], key, setting["value"])
 
 
 class CashflowImportCategory(BaseModel):
     id: str
     name: str
-    type: str
+    type: CategoryType
     icon: Optional[str] = None
     color: Optional[str] = None
 
@@ -1942,11 +1818,11 @@ class CashflowImportPlan(BaseModel):
     category_id: str
     name: str
     expected_amount: float
-    frequency: str
+    frequency: PlanFrequency
     expected_day: Optional[int] = None
     start_month: str
     end_month: Optional[str] = None
-    status: str
+    status: PlanStatus
     notes: Optional[str] = None
 
 
@@ -1977,84 +1853,79 @@ class CashflowImport(BaseModel):
 def import_cashflow(data: CashflowImport, request: Request):
     user_id = require_auth(request)
 
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cashflow_id = str(uuid.uuid4())
-    share_id = str(uuid.uuid4())
-    now = datetime.utcnow().isoformat()
+    with get_db() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute(
-        "INSERT INTO cashflows (id, name, description, owner_id, share_id, is_public, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, 0, %s, %s)",
-        (cashflow_id, data.name, data.description, user_id, share_id, now, now),
-    )
+        cashflow_id = new_id()
+        share_id = new_id()
+        now = datetime.utcnow().isoformat()
 
-    member_id = str(uuid.uuid4())
-    cursor.execute(
-        "INSERT INTO cashflow_members (id, cashflow_id, user_id, role, invited_at) VALUES (%s, %s, %s, 'owner', %s)",
-        (member_id, cashflow_id, user_id, now),
-    )
-
-    category_id_map = {}
-    for cat in data.categories:
-        new_cat_id = str(uuid.uuid4())
-        category_id_map[cat.id] = new_cat_id
-        cursor.execute(
-            "INSERT INTO categories (id, cashflow_id, name, type, icon, color) VALUES (%s, %s, %s, %s, %s, %s)",
-            (new_cat_id, cashflow_id, cat.name, cat.type, cat.icon, cat.color),
-        )
+        with conn.transaction():
+            cursor.execute(
+                INSERT_CASHFLOW,
+                (cashflow_id, data.name, data.description, user_id, share_id, now, now),
+            )
 
-    plan_id_map = {}
-    for plan in data.plans:
-        new_plan_id = str(uuid.uuid4())
-        plan_id_map[plan.id] = new_plan_id
-        new_category_id = category_id_map[plan.category_id]
-        cursor.execute(
-            """INSERT INTO plans (id, cashflow_id, category_id, name, expected_amount, frequency,
-               expected_day, start_month, end_month, status, notes, created_at, updated_at)
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
-            (
-                new_plan_id,
-                cashflow_id,
-                new_category_id,
-                plan.name,
-                plan.expected_amount,
-                plan.frequency,
-                plan.expected_day,
-                plan.start_month,
-                plan.end_month,
-                plan.status,
-                plan.notes,
-                now,
-                now,
-            ),
-        )
+            member_id = new_id()
+            cursor.execute(
+                INSERT_OWNER,
+                (member_id, cashflow_id, user_id, now),
+            )
 
-    for entry in data.entries:
-        new_entry_id = str(uuid.uuid4())
-        new_plan_id = plan_id_map[entry.plan_id]
-        cursor.execute(
-            """INSERT INTO entries (id, plan_id, month_year, amount, date, notes, created_at)
-               VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-            (
-                new_entry_id,
-                new_plan_id,
-                entry.month_year,
-                entry.amount,
-                entry.date,
-                entry.notes,
-                now,
-            ),
-        )
+            category_id_map = dict(
+                zip([cat.id for cat in data.categories], new_ids(len(data.categories)))
+            )
+            cursor.executemany(
+                INSERT_CATEGORY,
+                [
+                    (category_id_map[cat.id], cashflow_id, cat.name, cat.type, cat.icon, cat.color)
+                    for cat in data.categories
+                ],
+            )
 
-    for setting in data.settings:
-        cursor.execute(
-            "INSERT INTO settings (cashflow_id, key, value) VALUES (%s, %s, %s)",
-            (cashflow_id, setting.key, setting.value),
-        )
+            plan_id_map = dict(zip([plan.id for plan in data.plans], new_ids(len(data.plans))))
+            cursor.executemany(
+                INSERT_PLAN,
+                [
+                    (
+                        plan_id_map[plan.id],
+                        cashflow_id,
+                        category_id_map[plan.category_id],
+                        plan.name,
+                        plan.expected_amount,
+                        plan.frequency,
+                        plan.expected_day,
+                        plan.start_month,
+                        plan.end_month,
+                        plan.status,
+                        plan.notes,
+                        now,
+                        now,
+                    )
+                    for plan in data.plans
+                ],
+            )
 
-    conn.commit()
-    conn.close()
+            with cursor.copy(
+                "COPY entries (id, plan_id, month_year, amount, date, notes, created_at) FROM STDIN"
+            ) as copy:
+                for entry, entry_id in zip(data.entries, new_ids(len(data.entries))):
+                    copy.write_row(
+                        (
+                            entry_id,
+                            plan_id_map[entry.plan_id],
+                            entry.month_year,
+                            entry.amount,
+                            entry.date,
+                            entry.notes,
+                            now,
+                        )
+                    )
+
+            cursor.executemany(
+                INSERT_SETTING,
+                [(cashflow_id, setting.key, setting.value) for setting in data.settings],
+            )
 
     return {
         "id": cashflow_id,